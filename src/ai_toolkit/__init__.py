@@ -1,7 +1,13 @@
 # Package metadata and public exports
 __version__ = "0.1.0"
 
-# Expose the CLI entrypoint at package import time for convenience
-from .main import cli  # noqa: F401
-
 __all__ = ["cli", "__version__"]
+
+
+def __getattr__(name):
+    # Import the CLI entrypoint lazily: it pulls in LangChain, GitPython and the
+    # model providers, which reading `__version__` should not pay for
+    if name == "cli":
+        from .main import cli
+        return cli
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,51 @@
+from typing import Union
+
+from langchain.messages import SystemMessage
+
+from ai_toolkit.model_helper import is_anthropic_model
+
+# Anthropic keeps an "ephemeral" cache entry alive for ~5 minutes after last use
+EPHEMERAL_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def make_cacheable(text: str, model_name: str) -> SystemMessage:
+    """Wrap a static system prompt so providers can serve it from their prompt cache.
+
+    Anthropic only caches prefixes that carry an explicit `cache_control`
+    breakpoint, so the prompt is sent as a single text block marked ephemeral.
+    OpenAI caches identical prompt prefixes automatically and rejects unknown
+    block fields, so other providers receive a plain SystemMessage; keeping the
+    static prompt first is all that is needed there.
+
+    Args:
+        text: The static system prompt text
+        model_name: The LLM model the message will be sent to
+
+    Returns:
+        A SystemMessage suitable for use as the cached conversation prefix.
+    """
+    if not is_anthropic_model(model_name):
+        return SystemMessage(text)
+
+    return SystemMessage(
+        content=[{"type": "text", "text": text, "cache_control": EPHEMERAL_CACHE_CONTROL}]
+    )
+
+
+def make_cacheable_template(template: str, model_name: str) -> tuple[str, Union[str, list[dict]]]:
+    """Return a human message template that providers can serve from their prompt cache.
+
+    Same as `make_cacheable`, but for a prompt template whose variables are
+    filled in per call, e.g. a diff shared by several requests in one run.
+
+    Args:
+        template: The message template text
+        model_name: The LLM model the message will be sent to
+
+    Returns:
+        A `(role, content)` pair for `ChatPromptTemplate.from_messages`.
+    """
+    if not is_anthropic_model(model_name):
+        return ("human", template)
+
+    return ("human", [{"type": "text", "text": template, "cache_control": EPHEMERAL_CACHE_CONTROL}])
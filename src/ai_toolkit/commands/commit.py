@@ -1,10 +1,14 @@
 import click
+import functools
 from typing import Optional
-from langchain.messages import HumanMessage, AIMessage, SystemMessage
-from ai_toolkit.model_helper import get_model
+from langchain.messages import HumanMessage, AIMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from ai_toolkit.cache_utils import make_cacheable
+from ai_toolkit.model_helper import get_model, get_smaller_model
 
 # GitPython is a project dependency; import directly
 from git import GitCommandError
+from ..diff_utils import classify_diff, get_trimmed_diff, trivial_commit_message
 from ..git_utils import GitHelper
 
 
@@ -31,7 +35,7 @@ COMMIT_MESSAGE_PROMPT = """You are an expert software developer tasked with writ
 - chore: Other changes that don't modify src or test files
 
 ## Instructions:
-1. Analyze the git diff provided below
+1. Analyze the git diff provided in the user message
 2. Determine the appropriate commit type based on the changes
 3. Write a clear, imperative mood description (e.g., "add feature" not "added feature")
 4. Keep the first line under 72 characters
@@ -42,24 +46,46 @@ COMMIT_MESSAGE_PROMPT = """You are an expert software developer tasked with writ
 6. Return ONLY the commit message text (no markdown code blocks, no explanations)
 7. Use present tense, imperative mood
 8. Be specific but concise
+9. The git diff is wrapped in <diff> tags"""
 
-## Git Diff:
-<diff>
-{diff}
-</diff>
 
-## Commit Message:"""
+# Separator line between candidates when several commit messages are requested at once
+CANDIDATE_SEPARATOR = "---"
+
+CANDIDATES_REQUEST = (
+    "Produce {count} distinct commit message candidates for this diff, each following the rules above. "
+    "Separate the candidates with a line containing only `" + CANDIDATE_SEPARATOR + "`. "
+    "Return ONLY the commit messages."
+)
+
+
+@functools.lru_cache(maxsize=None)
+def get_commit_prompt(model: str) -> ChatPromptTemplate:
+    """Return the commit message prompt template for the given model.
+
+    The template is built once per model: the static instructions are a fixed
+    (cacheable) system message and only the diff and the adjustment history
+    are substituted on each call.
+    """
+    return ChatPromptTemplate.from_messages([
+        make_cacheable(COMMIT_MESSAGE_PROMPT, model),
+        ("human", "<diff>\n{diff}\n</diff>"),
+        MessagesPlaceholder("history", optional=True),
+    ])
 
 
 def get_staged_diff() -> Optional[str]:
     """
     Retrieve the git diff of staged changes using GitPython.
 
+    Lockfiles, generated assets and vendored files are left out and the diff
+    is capped in size so it always fits in the LLM prompt.
+
     Returns:
         The diff output as a string, or None if there's an error or no staged changes.
     """
     try:
-        diff_output = GitHelper.get_diff("staged")
+        diff_output = get_trimmed_diff("staged")
         return diff_output
     except FileNotFoundError:
         click.echo("❌ Looks like Git isn't installed. Please install it first!", err=True)
@@ -75,36 +101,87 @@ def get_staged_diff() -> Optional[str]:
 def generate_commit_message(diff: str, messages: list, model: str = "gpt-4o-mini") -> Optional[str]:
     """
     Generate a commit message using LLM based on the git diff and an existing
-    conversation (messages). The messages list is expected to already contain
-    the initial prompt/user message.
+    conversation (messages). The messages list holds the adjustment context
+    (the latest attempt and user feedback) that follows the prompt and diff.
+    
+    The response is streamed to the terminal as it is generated so the user
+    sees the message take shape instead of waiting for the full completion.
     
     Args:
         diff: The git diff output
-        messages: The conversation history
+        messages: The adjustment context
         model: The LLM model to use for completion
     """
     click.echo("✨ Let me analyze your changes and craft a commit message...")
 
     llm = get_model(model, temperature=0.3)
-    
-    response = llm.invoke(messages)
+    chain = get_commit_prompt(model) | llm
+
+    click.echo("\n📝 Here's what I came up with:")
+    click.echo("=" * 60)
 
-    commit_message = str(response.content).strip()
+    chunks = []
+    for chunk in chain.stream({"diff": diff, "history": messages}):
+        click.echo(chunk.text, nl=False)
+        chunks.append(chunk.text)
+    click.echo()  # Print newline at the end
+    click.echo("=" * 60)
+
+    commit_message = "".join(chunks).strip()
     return commit_message
 
 
-def perform_git_commit(commit_message: str) -> bool:
+def split_candidates(response: str) -> list[str]:
+    """Split a multi-candidate LLM response into the individual commit messages."""
+    candidates: list[list[str]] = [[]]
+    for line in response.splitlines():
+        if line.strip() == CANDIDATE_SEPARATOR:
+            candidates.append([])
+        else:
+            candidates[-1].append(line)
+    return [message for message in ("\n".join(lines).strip() for lines in candidates) if message]
+
+
+def choose_candidate(diff: str, count: int, model: str) -> Optional[str]:
+    """
+    Generate several commit message candidates in a single LLM call and let the
+    user pick one. The instructions and diff are sent once for all candidates.
+    
+    Args:
+        diff: The git diff output
+        count: Number of candidates to request
+        model: The LLM model to use for completion
+        
+    Returns:
+        The chosen commit message, or None if no candidate could be generated
+    """
+    request = [HumanMessage(CANDIDATES_REQUEST.format(count=count))]
+    response = generate_commit_message(diff, messages=request, model=model)
+    candidates = split_candidates(response) if response else []
+    if len(candidates) <= 1:
+        return candidates[0] if candidates else None
+
+    click.echo("\nCandidates:")
+    for i, candidate in enumerate(candidates, 1):
+        click.echo(f"  {i}. {candidate.splitlines()[0]}")
+
+    index = click.prompt("Pick a candidate", type=click.IntRange(1, len(candidates)), default=1)
+    return candidates[index - 1]
+
+
+def perform_git_commit(commit_message: str, skip_hooks: bool = False) -> bool:
     """
     Perform the actual git commit with the provided message using GitPython.
     
     Args:
         commit_message: The commit message to use
+        skip_hooks: Do not run the pre-commit and commit-msg hooks
         
     Returns:
         True if commit was successful, False otherwise
     """
     try:
-        GitHelper.commit(commit_message)
+        GitHelper.commit(commit_message, skip_hooks=skip_hooks)
         return True
     except FileNotFoundError:
         click.echo("❌ Looks like Git isn't installed. Please install it first!", err=True)
@@ -118,8 +195,23 @@ def perform_git_commit(commit_message: str) -> bool:
 
 
 @click.command()
+@click.option(
+    "--candidates",
+    "candidates",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of commit message candidates to generate in one LLM call",
+)
+@click.option(
+    "--no-verify",
+    "skip_hooks",
+    is_flag=True,
+    default=False,
+    help="Skip the pre-commit and commit-msg hooks when committing",
+)
 @click.pass_context
-def commit(ctx):
+def commit(ctx, candidates: int, skip_hooks: bool):
     """Generate a commit message based on staged changes with optional adjustments."""
     model = ctx.obj["model"]
     diff = get_staged_diff()
@@ -127,24 +219,31 @@ def commit(ctx):
         click.echo("💡 Looks like there's nothing staged yet. Try 'git add' first!")
         return
 
-    # Conversation messages for LLM (keeps history across adjustments)
-    messages: list = [SystemMessage(COMMIT_MESSAGE_PROMPT.format(diff=diff))]
+    # Right-size the work: trivial diffs need no LLM and small ones a smaller model
+    diff_size = classify_diff(diff)
+    if diff_size == "small":
+        model = get_smaller_model(model)
 
     # Initial generation
-    commit_message = generate_commit_message(diff, messages=messages, model=model)
-    if commit_message is None:
-        return
-
-    # Append assistant's message so the LLM conversation has history
-    messages.append(AIMessage(commit_message))
-
-    # Interactive loop: commit, adjustment, or abort
-    while True:
-        click.echo("\n📝 Here's what I came up with:")
+    commit_message: Optional[str]
+    if diff_size == "trivial":
+        commit_message = trivial_commit_message(diff)
+        click.echo("\n📝 Only renames or whitespace changes here, so no AI needed:")
         click.echo("=" * 60)
         click.echo(commit_message)
         click.echo("=" * 60)
+    elif candidates > 1:
+        commit_message = choose_candidate(diff, count=candidates, model=model)
+        if commit_message is None:
+            click.echo("❌ Couldn't generate any commit message candidates.", err=True)
+            return
+    else:
+        commit_message = generate_commit_message(diff, messages=[], model=model)
+        if commit_message is None:
+            return
 
+    # Interactive loop: commit, adjustment, or abort
+    while True:
         choice = click.prompt(
             "Choose an action",
             type=click.Choice(["commit", "adjustment", "abort"], case_sensitive=False),
@@ -153,7 +252,7 @@ def commit(ctx):
         ).lower()
 
         if choice == "commit":
-            if perform_git_commit(commit_message):
+            if perform_git_commit(commit_message, skip_hooks=skip_hooks):
                 click.echo("🎉 All done! Your changes are committed.")
             return
         elif choice == "abort":
@@ -175,14 +274,14 @@ def commit(ctx):
                 + "\nPlease produce a revised commit message following Conventional Commits. Return ONLY the commit message text."
             )
 
-            messages.append(HumanMessage(user_feedback_message))
+            # Only the latest attempt and its feedback are sent (the prompt template adds the
+            # instructions and diff), so each turn costs the same no matter how many came before
+            messages = [AIMessage(commit_message), HumanMessage(user_feedback_message)]
 
-            # Generate a revised commit message using conversation history
+            # Generate a revised commit message from the latest attempt and feedback
             revised = generate_commit_message(diff, messages=messages, model=model)
             if revised is None:
                 click.echo("Failed to generate an adjusted commit message. Returning to options.")
                 continue
 
-            # Append assistant reply and update current message
-            messages.append(AIMessage(revised))
             commit_message = revised
@@ -1,8 +1,14 @@
 """Review command package."""
 
-from ai_toolkit.commands.review.workflow import perform_review, synthesize_and_refine_review
+from ai_toolkit.commands.review.workflow import (
+    perform_review,
+    run_specialist_reviews,
+    synthesize_and_refine_review,
+)
 from ai_toolkit.commands.review.analyzers import (
     persona_analyzer,
+    apersona_analyzer,
+    combined_analyzer,
 )
 from ai_toolkit.commands.review.review_cli import review
 from ai_toolkit.commands.review.prompts import (
@@ -10,15 +16,20 @@ from ai_toolkit.commands.review.prompts import (
     MAINTAINABILITY_REVIEW_TEMPLATE,
     SECURITY_REVIEW_TEMPLATE,
     SYNTHESIS_TEMPLATE,
+    PERSONAS_COMBINED_TEMPLATE,
 )
 
 __all__ = [
     "review",
     "perform_review",
+    "run_specialist_reviews",
     "synthesize_and_refine_review",
     "persona_analyzer",
+    "apersona_analyzer",
+    "combined_analyzer",
     "PERFORMANCE_REVIEW_TEMPLATE",
     "MAINTAINABILITY_REVIEW_TEMPLATE",
     "SECURITY_REVIEW_TEMPLATE",
     "SYNTHESIS_TEMPLATE",
+    "PERSONAS_COMBINED_TEMPLATE",
 ]
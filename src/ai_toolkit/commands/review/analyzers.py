@@ -1,38 +1,104 @@
 """Code analysis functions for different review perspectives."""
 
-from langchain.messages import HumanMessage, SystemMessage
+import functools
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from langchain.messages import HumanMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+from ai_toolkit.cache_utils import make_cacheable_template
 
 from ai_toolkit.commands.review.prompts import (
     PERFORMANCE_REVIEW_TEMPLATE,
     MAINTAINABILITY_REVIEW_TEMPLATE,
     SECURITY_REVIEW_TEMPLATE,
+    PERSONAS_COMBINED_TEMPLATE,
 )
-from ai_toolkit.commands.review.review_models import ReviewResult
-from ai_toolkit.model_helper import get_model
+from ai_toolkit.commands.review.review_models import CombinedReviewResult, ReviewResult
+from ai_toolkit.diff_utils import hash_diff
+from ai_toolkit.model_helper import get_structured_model
+
+# Leading human turn shared by every analyzer; only the diff varies per call
+DIFF_MESSAGE_TEMPLATE = "Here are the code changes:\n<diff>\n{diff}\n</diff>"
+
+# Instructions for each review persona (read-only)
+ANALYZER_PROMPTS: Mapping[str, str] = MappingProxyType({
+    "performance": PERFORMANCE_REVIEW_TEMPLATE,
+    "maintainability": MAINTAINABILITY_REVIEW_TEMPLATE,
+    "security": SECURITY_REVIEW_TEMPLATE,
+})
+
+# Persona reviews already computed in this process, keyed by (diff_hash, persona, model)
+_REVIEW_MEMO: dict[tuple[str, str, str], ReviewResult] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _analyzer_prompt(instructions: str, model: str) -> ChatPromptTemplate:
+    """Return the prompt template for an analyzer, built once per instructions and model.
+
+    The diff comes first and the analyzer instructions last, so all persona
+    calls on the same diff share the diff as a cacheable prompt prefix.
+    """
+    return ChatPromptTemplate.from_messages([
+        make_cacheable_template(DIFF_MESSAGE_TEMPLATE, model),
+        HumanMessage(instructions),
+    ])
+
+
+def _persona_prompt(persona: str, model: str) -> ChatPromptTemplate:
+    """Return the prompt template for a single persona review."""
+    instructions = ANALYZER_PROMPTS.get(persona)
+    if instructions is None:
+        raise ValueError(f"Invalid persona '{persona}'. Valid options are: {list(ANALYZER_PROMPTS.keys())}")
+
+    return _analyzer_prompt(instructions, model)
+
 
-def persona_analyzer(diff: str, persona: str, model: str) -> ReviewResult:
+def persona_analyzer(diff: str, persona: str, model: str, diff_hash: Optional[str] = None) -> ReviewResult:
     """Analyze the provided diff for performance issues and optimizations.
 
-    Call the LLM completion API to analyze the provided diff.
+    Call the LLM completion API to analyze the provided diff. Results are
+    memoized per (diff_hash, persona, model) for the lifetime of the process;
+    pass a precomputed `diff_hash` to avoid rehashing the diff.
+    """
+    key = (diff_hash or hash_diff(diff), persona, model)
+    if key in _REVIEW_MEMO:
+        return _REVIEW_MEMO[key]
+
+    prompt = _persona_prompt(persona, model)
+
+    chain = prompt | get_structured_model(model, ReviewResult)
+    result = chain.invoke({"diff": diff})
+    _REVIEW_MEMO[key] = result  # type: ignore
+    return result # type: ignore
+
+
+async def apersona_analyzer(diff: str, persona: str, model: str, diff_hash: Optional[str] = None) -> ReviewResult:
+    """Async variant of `persona_analyzer`.
+
+    Awaits the LLM call so several personas can be reviewed concurrently.
+    """
+    key = (diff_hash or hash_diff(diff), persona, model)
+    if key in _REVIEW_MEMO:
+        return _REVIEW_MEMO[key]
+
+    prompt = _persona_prompt(persona, model)
+
+    chain = prompt | get_structured_model(model, ReviewResult)
+    result = await chain.ainvoke({"diff": diff})
+    _REVIEW_MEMO[key] = result  # type: ignore
+    return result # type: ignore
+
+
+def combined_analyzer(diff: str, model: str) -> CombinedReviewResult:
+    """Analyze the provided diff from every specialist perspective in one LLM call.
+
+    The diff is sent once and the model returns one section per persona, which
+    saves the repeated diff and boilerplate tokens of separate persona calls.
     """
+    prompt = _analyzer_prompt(PERSONAS_COMBINED_TEMPLATE, model)
 
-    analyzer_prompt_dictionary = {
-        "performance": PERFORMANCE_REVIEW_TEMPLATE,
-        "maintainability": MAINTAINABILITY_REVIEW_TEMPLATE,
-        "security": SECURITY_REVIEW_TEMPLATE,
-    }
-
-    if persona not in analyzer_prompt_dictionary:
-        raise ValueError(f"Invalid persona '{persona}'. Valid options are: {list(analyzer_prompt_dictionary.keys())}")
-    
-    system_prompt = analyzer_prompt_dictionary[persona]
-
-    messages = [
-        SystemMessage(system_prompt),
-        HumanMessage(content=f"Here are the code changes:\n<diff>\n{diff}\n</diff>"),
-    ]
-
-    llm = get_model(model)
-    llm_with_output = llm.with_structured_output(ReviewResult) 
-    result = llm_with_output.invoke(messages)
-    return result # type: ignore
\ No newline at end of file
+    chain = prompt | get_structured_model(model, CombinedReviewResult)
+    result = chain.invoke({"diff": diff})
+    return result # type: ignore
@@ -1,30 +1,68 @@
 """CLI command for code review."""
 
+import asyncio
+import logging
 import textwrap
-import warnings
+from typing import Optional
+
 import click
 from git import GitCommandError
 
-from ai_toolkit.git_utils import GitHelper
+from ai_toolkit.diff_utils import get_trimmed_diff, hash_diff
 from ai_toolkit.commands.review.workflow import perform_review
+from ai_toolkit.git_utils import DiffMode
+from ai_toolkit.model_helper import get_model
 import os
 from pathlib import Path
 from datetime import datetime
 
-# Suppress the specific ResourceWarning for subprocess on Windows
-warnings.filterwarnings("ignore", category=ResourceWarning, module="subprocess")
+logger = logging.getLogger(__name__)
+
+
+def _configure_logging(verbose: bool) -> None:
+    """Show the review progress messages only when `verbose` is set."""
+    package_logger = logging.getLogger("ai_toolkit")
+    if not package_logger.handlers:
+        package_logger.addHandler(logging.StreamHandler())
+    package_logger.setLevel(logging.INFO if verbose else logging.WARNING)
+
+
+async def _load_diff_and_warm_model(mode: DiffMode, model: str) -> Optional[str]:
+    """Fetch the diff while the chat model client is constructed in parallel.
+
+    `get_model` is memoized, so the review reuses the client built here. A
+    failure while warming the model is ignored; the review's own call reports it.
+    """
+    diff, _ = await asyncio.gather(
+        asyncio.to_thread(get_trimmed_diff, mode),
+        asyncio.to_thread(get_model, model),
+        return_exceptions=True,
+    )
+    if isinstance(diff, BaseException):
+        raise diff
+    return diff
 
 
 @click.command()
 @click.option("--staged", "staged", is_flag=True, default=False, help="Review staged changes")
 @click.option("--uncommitted", "uncommitted", is_flag=True, default=False, help="Review uncommitted changes")
+@click.option(
+    "--single-call",
+    "single_call",
+    is_flag=True,
+    default=False,
+    help="Run all specialist reviews in one batched LLM call (fewer input tokens)",
+)
+@click.option("--verbose", "-v", "verbose", is_flag=True, default=False, help="Show progress of each review phase")
 @click.pass_context
-def review(ctx, staged: bool, uncommitted: bool):
+def review(ctx, staged: bool, uncommitted: bool, single_call: bool, verbose: bool):
     """Review code changes and provide feedback.
 
     Defaults to reviewing staged changes when neither option is provided.
     Analyzes the diff and provides structured review comments.
     """
+    _configure_logging(verbose)
+
     # Default to staged if no flag is provided
     if not staged and not uncommitted:
         staged = True
@@ -32,8 +70,9 @@ def review(ctx, staged: bool, uncommitted: bool):
     try:
         # Get the appropriate diff
         # Determine mode and get diff
-        mode = "staged" if staged else "uncommitted"
-        diff = GitHelper.get_diff(mode)
+        mode: DiffMode = "staged" if staged else "uncommitted"
+        model = ctx.obj["model"]
+        diff = asyncio.run(_load_diff_and_warm_model(mode, model))
         diff_type = mode
         
         # Check if there's anything to review
@@ -43,23 +82,27 @@ def review(ctx, staged: bool, uncommitted: bool):
 
         # Write diff to markdown file and display info
         
-        click.echo(f"\n📝 Reviewing {diff_type} changes:")
-        click.echo("─" * 60)
+        logger.info("\n📝 Reviewing %s changes:", diff_type)
+        logger.info("─" * 60)
        
         # Perform the review
-        model = ctx.obj["model"]
-        review_result = perform_review(diff, model=model)
+        # Hash the diff once; it keys every cached review of this exact change
+        diff_hash = hash_diff(diff)
+        review_result = perform_review(diff, model=model, single_call=single_call, diff_hash=diff_hash)
         # Write review to markdown file
         reviews_dir = Path("reviews")
         reviews_dir.mkdir(exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         review_file = reviews_dir / f"review_{timestamp}.md"
         
-        with open(review_file, "w", encoding="utf-8") as f:
-            f.write(f"# Code Review - {mode.capitalize()} Changes\n\n")
-            f.write(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write("---\n\n")
-            f.write(review_result.str_markdown__())
+        content = "\n\n".join([
+            f"# Code Review - {mode.capitalize()} Changes",
+            f"**Date:** {now.strftime('%Y-%m-%d %H:%M:%S')}",
+            "---",
+            review_result.str_markdown__(),
+        ])
+        review_file.write_text(content, encoding="utf-8")
 
         click.echo(f"✅ Review saved to: {review_file}")
 
@@ -1,8 +1,14 @@
+import io
 import textwrap
-from typing import Optional
+from functools import cached_property
+from typing import Optional, TextIO
 from pydantic import BaseModel, Field
 
 
+# Rank of each known severity level; issues ranked at or above MEDIUM are significant
+SEVERITY_RANKS = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+MEDIUM_SEVERITY_RANK = SEVERITY_RANKS["medium"]
+
 class ReviewIssue(BaseModel):
     """Model representing a schema for issues identified during code review."""
 
@@ -14,31 +20,40 @@ class ReviewIssue(BaseModel):
     snippet:  Optional[str] = Field(description="Optional Code snippet related to the issue")
     suggestion: Optional[str] = Field(default=None, description="Suggested fix or improvement for the issue in clear text")
 
-    def str_markdown__(self) -> str:
-        parts = []
+    def is_significant(self) -> bool:
+        """Return True for Medium or higher severity; unknown severities count as significant."""
+        rank = SEVERITY_RANKS.get(self.severity.strip().lower(), MEDIUM_SEVERITY_RANK)
+        return rank >= MEDIUM_SEVERITY_RANK
 
+    def write_markdown(self, fp: TextIO) -> None:
+        """Write the issue as markdown to `fp`, one fragment at a time."""
         # Add severity and category as header
-        parts.append(f"### [{self.severity}] {self.category}")
-        
+        fp.write(f"### [{self.severity}] {self.category}")
+
         # Add file path if available
         if self.file_path:
-            parts.append(f"**File:** `{self.file_path}`")
-        
+            fp.write(f"\n**File:** `{self.file_path}`")
+
         # Add description
-        parts.append(f"\n**Description:**")
-        parts.append(f"{self.description}")
+        fp.write(f"\n\n**Description:**\n{self.description}")
 
         # Add snippet if available
         if self.snippet:
-            parts.append(f"\n**Code Snippet:**")
-            parts.append(f"```\n{self.snippet}\n```")
-        
+            fp.write(f"\n\n**Code Snippet:**\n```\n{self.snippet}\n```")
+
         # Add suggestion if available
         if self.suggestion:
-            parts.append(f"\n**Suggestion:**")
-            parts.append(f"{self.suggestion}")
-        
-        return "\n".join(parts)
+            fp.write(f"\n\n**Suggestion:**\n{self.suggestion}")
+
+    @cached_property
+    def markdown(self) -> str:
+        """The issue rendered as markdown, built on first access."""
+        buffer = io.StringIO()
+        self.write_markdown(buffer)
+        return buffer.getvalue()
+
+    def str_markdown__(self) -> str:
+        return self.markdown
 
 
 class ReviewResult(BaseModel):
@@ -48,23 +63,36 @@ class ReviewResult(BaseModel):
     summary: str = Field(description="Summary of the code review findings in a paragraph format with bullet points")
     aggregated_suggestions: list[str] = Field(description="List of aggregated suggestions for improvement")
 
-    def str_markdown__(self) -> str:
-        parts = []
+    def has_significant_issues(self) -> bool:
+        """Return True if any issue is of Medium or higher severity."""
+        return any(issue.is_significant() for issue in self.issues)
 
+    def write_markdown(self, fp: TextIO) -> None:
+        """Write the review as markdown to `fp`, one fragment at a time."""
         # Add summary with markdown header
-        parts.append("# Code Review Summary\n")
-        parts.append(self.summary)
+        fp.write(f"# Code Review Summary\n\n{self.summary}")
 
         # Add issues section
-        parts.append("\n## Identified Issues\n")
+        fp.write("\n\n## Identified Issues\n")
         for i, issue in enumerate(self.issues, 1):
-            parts.append(f"#### Issue {i}")
-            parts.append(issue.str_markdown__())
-            parts.append("")  # Empty line for spacing
+            fp.write(f"\n#### Issue {i}\n")
+            fp.write(issue.markdown)
+            fp.write("\n")  # Empty line for spacing
 
         # Add suggestions section
-        parts.append("\n## Suggestions for Improvement\n")
+        fp.write("\n\n## Suggestions for Improvement\n")
         for i, suggestion in enumerate(self.aggregated_suggestions, 1):
-            parts.append(f"{i}. {suggestion}")
+            fp.write(f"\n{i}. {suggestion}")
+
+    def str_markdown__(self) -> str:
+        buffer = io.StringIO()
+        self.write_markdown(buffer)
+        return buffer.getvalue()
+
+
+class CombinedReviewResult(BaseModel):
+    """Model representing all specialist reviews produced by a single LLM call"""
 
-        return "\n".join(parts)
\ No newline at end of file
+    performance: ReviewResult = Field(description="Findings of the performance specialist")
+    maintainability: ReviewResult = Field(description="Findings of the maintainability specialist")
+    security: ReviewResult = Field(description="Findings of the security specialist")
@@ -1,15 +1,91 @@
 """Review workflow orchestration and synthesis."""
 
-import click
-import textwrap
-from typing import Dict
-from ai_toolkit.commands.review.prompts import SYNTHESIS_TEMPLATE
-from langchain.messages import HumanMessage, SystemMessage
+import asyncio
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+from ai_toolkit.commands.review.prompts import PROMPT_VERSION, SYNTHESIS_TEMPLATE
+from langchain.messages import HumanMessage
 from ai_toolkit.commands.review.analyzers import (
-    persona_analyzer
+    apersona_analyzer,
+    combined_analyzer,
 )
 from ai_toolkit.commands.review.review_models import ReviewResult
-from ai_toolkit.model_helper import get_model
+from ai_toolkit.cache_utils import make_cacheable
+from ai_toolkit.diff_utils import chunk_diff_by_file, classify_diff, hash_diff, needs_security_review
+from ai_toolkit.model_helper import DISABLE_CACHE_ENV_VAR, LLM_CACHE_PATH, get_structured_model
+
+logger = logging.getLogger(__name__)
+
+# Specialist personas run during phase 1 of the review
+PERSONAS = ("performance", "maintainability", "security")
+
+# Upper bound on specialist LLM calls in flight at the same time
+MAX_CONCURRENCY = 3
+
+# Final reviews stored by content key, so an identical diff is never reviewed twice
+REVIEW_CACHE_DIR = LLM_CACHE_PATH.parent / "reviews"
+
+
+async def run_specialist_reviews(
+    diff: str,
+    model: str,
+    max_concurrency: int = MAX_CONCURRENCY,
+    diff_hash: Optional[str] = None,
+) -> Dict[str, ReviewResult]:
+    """Run all specialist persona reviews concurrently.
+
+    Large diffs are split into chunks of whole files (see `chunk_diff_by_file`);
+    each persona reviews every chunk and its findings are merged into one
+    review. All persona and chunk calls are independent network round-trips,
+    so they are fanned out with `asyncio.gather` and the total latency is that
+    of the slowest one. The security persona is skipped when the diff touches
+    nothing security-relevant (auth, crypto, SQL, process or file I/O, ...).
+
+    Args:
+        diff: The git diff to review
+        model: The LLM model to use for every persona
+        max_concurrency: Maximum number of LLM calls in flight at once
+        diff_hash: Precomputed hash of the diff, shared by all personas as cache key
+
+    Returns:
+        Dictionary mapping each persona name to its review.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    chunks = chunk_diff_by_file(diff)
+    # A single chunk is the whole diff, so its precomputed hash still applies
+    chunk_hash = (diff_hash or hash_diff(diff)) if len(chunks) == 1 else None
+
+    async def run_chunk(persona: str, chunk: str) -> ReviewResult:
+        async with semaphore:
+            return await apersona_analyzer(chunk, persona=persona, model=model, diff_hash=chunk_hash)
+
+    async def run_persona(persona: str) -> ReviewResult:
+        logger.info("\n  ✓ Running %s analysis...", persona)
+        results = await asyncio.gather(*(run_chunk(persona, chunk) for chunk in chunks))
+        logger.info("  ✓ %s analysis complete.", persona.capitalize())
+        return merge_reviews(results)
+
+    personas = list(PERSONAS)
+    if not needs_security_review(diff):
+        personas.remove("security")
+        logger.info("\n  ⏭️  Skipping security analysis: no security-relevant changes found.")
+
+    results = await asyncio.gather(*(run_persona(persona) for persona in personas))
+    return dict(zip(personas, results))
+
+
+def merge_reviews(reviews: list[ReviewResult]) -> ReviewResult:
+    """Merge the reviews of separate diff chunks by the same persona into one."""
+    if len(reviews) == 1:
+        return reviews[0]
+    return ReviewResult(
+        issues=[issue for review in reviews for issue in review.issues],
+        summary="\n\n".join(review.summary for review in reviews),
+        aggregated_suggestions=[suggestion for review in reviews for suggestion in review.aggregated_suggestions],
+    )
 
 
 def synthesize_and_refine_review(
@@ -30,33 +106,87 @@ def synthesize_and_refine_review(
     Returns:
         The synthesized and refined final review report.
     """
-    click.echo("  🔄 Synthesizing all perspectives and refining recommendations...")
+    logger.info("  🔄 Synthesizing all perspectives and refining recommendations...")
     
-    # Format the specialist reviews for the prompt
-    specialists_text = textwrap.dedent(f"""
-        Performance Review:
-        {specialist_reviews.get('performance').__str__() if specialist_reviews.get('performance') else 'No performance review available.'}
-
-        Maintainability Review:
-        {specialist_reviews.get('maintainability').__str__() if specialist_reviews.get('maintainability') else 'No maintainability review available.'}
-
-        Security Review:
-        {specialist_reviews.get('security').__str__() if specialist_reviews.get('security') else 'No security review available.'}
-        """).strip()
+    # Pass each specialist review to the synthesizer as JSON, tagged with its persona
+    sections = []
+    for persona in PERSONAS:
+        review = specialist_reviews.get(persona)
+        if review:
+            sections.append(f"<{persona}>{review.model_dump_json()}</{persona}>")
+    specialists_text = "\n".join(sections)
 
     messages = [
-        SystemMessage(SYNTHESIS_TEMPLATE),
+        make_cacheable(SYNTHESIS_TEMPLATE, model),
         HumanMessage(content=f"<specialists_reviews>\n{specialists_text}\n</specialists_reviews>"),
     ]
 
-    llm = get_model(model)
-    llm_with_output = llm.with_structured_output(ReviewResult)
-    llm_response = llm_with_output.invoke(messages)
-    click.echo("  ✅ Synthesis and refinement complete")
+    llm_response = get_structured_model(model, ReviewResult).invoke(messages)
+    logger.info("  ✅ Synthesis and refinement complete")
     return llm_response # type: ignore
 
 
-def perform_review(diff: str, model: str) -> ReviewResult:
+def no_significant_issues_review(specialist_reviews: Dict[str, ReviewResult]) -> ReviewResult:
+    """Build the final report locally when no specialist found a significant issue.
+
+    Any low-severity findings are kept as-is so nothing reported is lost.
+    """
+    issues = [issue for review in specialist_reviews.values() for issue in review.issues]
+    return ReviewResult(
+        issues=issues,
+        summary="No significant issues found. The specialist reviews reported only low-severity findings, if any.",
+        aggregated_suggestions=[issue.suggestion for issue in issues if issue.suggestion],
+    )
+
+
+def no_semantic_changes_review() -> ReviewResult:
+    """Build the final report locally for a diff that only renames files or changes trailing whitespace."""
+    return ReviewResult(
+        issues=[],
+        summary="No semantic changes found. The diff only renames files or changes trailing whitespace and blank lines, so it was not sent for review.",
+        aggregated_suggestions=[],
+    )
+
+
+def _review_cache_path(diff_hash: str, model: str, single_call: bool) -> Path:
+    """Return the cache file of the review of a diff with the given model, mode and prompts."""
+    key = f"{diff_hash}:{model}:{'single' if single_call else 'personas'}:{PROMPT_VERSION}"
+    return REVIEW_CACHE_DIR / f"{hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()}.json"
+
+
+def load_cached_review(diff_hash: str, model: str, single_call: bool) -> Optional[ReviewResult]:
+    """Return the stored review for this exact diff, model and prompts, or None.
+
+    Unreadable or outdated cache files are treated as a miss.
+    """
+    if os.environ.get(DISABLE_CACHE_ENV_VAR):
+        return None
+    try:
+        return ReviewResult.model_validate_json(_review_cache_path(diff_hash, model, single_call).read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached_review(diff_hash: str, model: str, single_call: bool, review: ReviewResult) -> None:
+    """Store a final review so later runs on the same diff can reuse it.
+
+    The cache is best effort: an unwritable or full cache directory is ignored.
+    """
+    if os.environ.get(DISABLE_CACHE_ENV_VAR):
+        return
+    try:
+        REVIEW_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _review_cache_path(diff_hash, model, single_call).write_text(review.model_dump_json(), encoding="utf-8")
+    except OSError as e:
+        logger.debug("Could not store the review in %s: %s", REVIEW_CACHE_DIR, e)
+
+
+def perform_review(
+    diff: str,
+    model: str,
+    single_call: bool = False,
+    diff_hash: Optional[str] = None,
+) -> ReviewResult:
     """Analyze a git diff and generate review comments using a comprehensive multi-phase workflow.
 
     This function implements a four-phase review process:
@@ -71,33 +201,50 @@ def perform_review(diff: str, model: str) -> ReviewResult:
     Args:
         diff: The git diff to review
         model: The LLM model to use for all analysis steps
+        single_call: Run all specialist personas in one batched LLM call
+            instead of one call per persona
+        diff_hash: Precomputed hash of the diff, used as cache key for the specialist reviews
         
     Returns:
         ReviewResult containing the final polished review
     """
 
-    
+    if classify_diff(diff) == "trivial":
+        # Renames and trailing-whitespace changes have nothing for the specialists to review
+        logger.info("\n  ⏭️  Only renames or trailing whitespace changed, skipping the LLM review")
+        return no_semantic_changes_review()
+
+    diff_hash = diff_hash or hash_diff(diff)
+    cached_review = load_cached_review(diff_hash, model, single_call)
+    if cached_review is not None:
+        logger.info("\n  ✅ Reusing the stored review of this exact diff")
+        return cached_review
+
     # Phase 2: Specialist reviews (performance, maintainability, security)
-    click.echo("\n\n🎯 PHASE 1: SPECIALIST REVIEWS")
-    click.echo("─" * 60)
-    
-    personas = ["performance", "maintainability", "security"]
-    specialist_reviews = {}
+    logger.info("\n\n🎯 PHASE 1: SPECIALIST REVIEWS")
+    logger.info("─" * 60)
     
-    for persona in personas:
-        click.echo(f"\n  ✓ Running {persona} analysis...")
-        specialist_reviews[persona] = persona_analyzer(diff, persona=persona, model=model)
-        click.echo(f"  ✓ {persona.capitalize()} analysis complete.")
+    if single_call:
+        logger.info("\n  ✓ Running combined specialist analysis...")
+        combined = combined_analyzer(diff, model=model)
+        specialist_reviews = {persona: getattr(combined, persona) for persona in PERSONAS}
+        logger.info("  ✓ Combined analysis complete.")
+    else:
+        specialist_reviews = asyncio.run(run_specialist_reviews(diff, model=model, diff_hash=diff_hash))
 
     # Phase 3: Synthesis & Refinement (lead architect perspective)
-    click.echo("\n\n🏗️  PHASE 2: SYNTHESIS & REFINEMENT")
-    click.echo("─" * 60)
+    logger.info("\n\n🏗️  PHASE 2: SYNTHESIS & REFINEMENT")
+    logger.info("─" * 60)
     
-    final_review = synthesize_and_refine_review(specialist_reviews, model=model)
+    if any(review.has_significant_issues() for review in specialist_reviews.values()):
+        final_review = synthesize_and_refine_review(specialist_reviews, model=model)
+    else:
+        # Nothing worth consolidating: skip the synthesis round-trip
+        logger.info("  ✅ No significant issues found, skipping synthesis")
+        final_review = no_significant_issues_review(specialist_reviews)
     
-    click.echo("\n" + "="*60)
-    click.echo("✅ CODE REVIEW COMPLETE")
-    click.echo("="*60)
+    logger.info("\n%s\n✅ CODE REVIEW COMPLETE\n%s", "=" * 60, "=" * 60)
+    store_cached_review(diff_hash, model, single_call, final_review)
     # Keep behavior consistent with existing tests: return empty ReviewResult
     result = final_review
     return result
@@ -0,0 +1,263 @@
+import hashlib
+import re
+from fnmatch import translate
+from typing import Final, Iterator, Literal, Optional
+
+from ai_toolkit.git_utils import DiffMode, GitHelper, UNTRACKED_FILES_HEADER
+
+
+DiffSize = Literal["trivial", "small", "large"]
+
+# Upper bound on the diff size sent to the LLM
+MAX_DIFF_BYTES = 60_000
+
+# Generated or vendored files that cost many tokens but carry little review signal
+LOW_SIGNAL_FILE_PATTERNS = (
+    "*.lock",
+    "package-lock.json",
+    "*.min.js",
+    "*.min.css",
+    "*.map",
+    "*.svg",
+)
+LOW_SIGNAL_DIRECTORIES = ("vendor", "vendors", "third_party", "node_modules", "dist")
+
+# The same files as git glob pathspecs, excluded from the diff by git itself
+LOW_SIGNAL_PATHSPECS = (
+    *(f"**/{pattern}" for pattern in LOW_SIGNAL_FILE_PATTERNS),
+    *(f"**/{directory}/**" for directory in LOW_SIGNAL_DIRECTORIES),
+)
+
+# Stands in for the diff when every changed file is low-signal, followed by the `--stat` summary
+LOW_SIGNAL_ONLY_HEADER = "# Only low-signal files changed (lockfiles, generated or vendored files); their diff is omitted:\n"
+
+# Largest diff chunk sent in a single review call; bigger diffs are reviewed file group by file group
+DIFF_CHUNK_BYTES = 20_000
+
+# Diffs whose changed lines total fewer bytes than this are handled by a smaller model
+SMALL_DIFF_BYTES = 4_000
+
+# Diff parsing patterns, compiled once at import
+_TRACKED_FILE_START_RE: Final = re.compile(r"^(?=diff --git )", re.MULTILINE)
+_UNTRACKED_FILE_START_RE: Final = re.compile(r"(?=\n\+\+\+ b/)")
+_CHANGED_LINE_RE: Final = re.compile(r"^(?!(?:\+\+\+|---) (?:\"?[ab]/|/dev/null))([+-])(.*)$", re.MULTILINE)
+_HUNK_HEADER_RE: Final = re.compile(r"^@@ -\d+(?:,(\d+))? \+\d+(?:,(\d+))? @@")
+_FILE_MODE_RE: Final = re.compile(r"^(?:new file|deleted file|old|new) mode ", re.MULTILINE)
+_RENAME_FROM_RE: Final = re.compile(r"^rename from (.+)$", re.MULTILINE)
+_RENAME_TO_RE: Final = re.compile(r"^rename to (.+)$", re.MULTILINE)
+_BINARY_FILE_RE: Final = re.compile(r"^Binary files ", re.MULTILINE)
+_LOW_SIGNAL_PATH_RE: Final = re.compile("|".join(
+    [f"(?:^|/){translate(pattern)}" for pattern in LOW_SIGNAL_FILE_PATTERNS]
+    + [f"(?:^|/)(?:{'|'.join(map(re.escape, LOW_SIGNAL_DIRECTORIES))})/"]
+))
+
+# Changes touching any of these are worth a security review
+_SECURITY_SENSITIVE_RE: Final = re.compile(
+    r"auth|login|passw|token|secret|credential|api[_-]?key|session|cookie|jwt|oauth|permission|role"
+    r"|crypt|hash|hmac|cipher|random|ssl|tls|cert"
+    r"|sql|query|select |insert |update |delete |execute|cursor"
+    r"|eval|exec|subprocess|shell|os\.system|popen|pickle|marshal|yaml\.load|deserializ"
+    r"|request|http|url|socket|upload|download|open\(|path|file|sanitiz|escape|html|template",
+    re.IGNORECASE,
+)
+
+
+def hash_diff(diff: str) -> str:
+    """Return a short content hash of the diff, used as a cache key."""
+    return hashlib.blake2b(diff.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def is_low_signal_path(path: str) -> bool:
+    """Return True for lockfiles, minified/generated assets and vendored files."""
+    return _LOW_SIGNAL_PATH_RE.search(path) is not None
+
+
+def _split_sections(text: str, start_re: re.Pattern) -> list[str]:
+    return [section for section in start_re.split(text) if section]
+
+
+def split_diff_by_file(diff: str) -> list[str]:
+    """Split a diff into one section per file, in their original order.
+
+    Tracked files start at their `diff --git` header; untracked files appended
+    by `GitHelper` start at their `+++ b/<path>` line.
+    """
+    tracked, _, untracked = diff.partition(UNTRACKED_FILES_HEADER)
+    return _split_sections(tracked, _TRACKED_FILE_START_RE) + _split_sections(untracked, _UNTRACKED_FILE_START_RE)
+
+
+def chunk_diff_by_file(diff: str, max_bytes: int = DIFF_CHUNK_BYTES) -> list[str]:
+    """Group the per-file sections of a diff into chunks of at most `max_bytes`.
+
+    Files are never split and keep their original order; a single file larger
+    than `max_bytes` gets a chunk of its own.
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    current_size = 0
+    for section in split_diff_by_file(diff):
+        section_size = len(section.encode("utf-8"))
+        if current and current_size + section_size > max_bytes:
+            chunks.append("".join(current))
+            current, current_size = [], 0
+        current.append(section)
+        current_size += section_size
+
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+def truncate_diff(diff: str, max_bytes: int = MAX_DIFF_BYTES) -> str:
+    """Drop whole files from the diff, largest first, until it fits in `max_bytes`.
+
+    A trailing `# omitted N files totaling M bytes` line tells the LLM that the
+    diff is incomplete.
+    """
+    if len(diff.encode("utf-8")) <= max_bytes:
+        return diff
+
+    tracked, _, untracked = diff.partition(UNTRACKED_FILES_HEADER)
+    sections = [(text, False) for text in _split_sections(tracked, _TRACKED_FILE_START_RE)]
+    sections += [(text, True) for text in _split_sections(untracked, _UNTRACKED_FILE_START_RE)]
+    sizes = [len(text.encode("utf-8")) for text, _ in sections]
+
+    total = sum(sizes)
+    omitted: set[int] = set()
+    for index in sorted(range(len(sections)), key=sizes.__getitem__, reverse=True):
+        if total <= max_bytes:
+            break
+        omitted.add(index)
+        total -= sizes[index]
+
+    kept_tracked = [text for i, (text, is_untracked) in enumerate(sections) if i not in omitted and not is_untracked]
+    kept_untracked = [text for i, (text, is_untracked) in enumerate(sections) if i not in omitted and is_untracked]
+
+    parts = kept_tracked
+    if kept_untracked:
+        parts += [UNTRACKED_FILES_HEADER, *kept_untracked]
+    omitted_bytes = sum(sizes[i] for i in omitted)
+    parts.append(f"\n# omitted {len(omitted)} files totaling {omitted_bytes} bytes\n")
+    return "".join(parts)
+
+
+def get_trimmed_diff(mode: DiffMode = "staged", max_bytes: int = MAX_DIFF_BYTES) -> Optional[str]:
+    """Return the diff for `mode` with low-signal files removed and its size bounded.
+
+    Lockfiles, minified assets and vendored directories are excluded while the
+    diff is generated, then the largest remaining files are dropped until the
+    diff fits in `max_bytes`. When only low-signal files changed, their
+    `--stat` summary under LOW_SIGNAL_ONLY_HEADER stands in for the diff.
+
+    Returns:
+        The trimmed diff, or None if there are no changes.
+
+    Raises:
+        GitCommandError: If git command fails.
+    """
+    diff = GitHelper.get_diff(mode, exclude=LOW_SIGNAL_PATHSPECS)
+    if diff is None:
+        stat = GitHelper.get_diff_stat(mode)
+        return LOW_SIGNAL_ONLY_HEADER + stat + "\n" if stat else None
+
+    return truncate_diff(diff, max_bytes)
+
+
+def _changed_lines(diff: str) -> tuple[list[str], list[str]]:
+    """Return the (removed, added) content lines of a diff, without their +/- prefix."""
+    removed: list[str] = []
+    added: list[str] = []
+    for match in _CHANGED_LINE_RE.finditer(diff):
+        (added if match.group(1) == "+" else removed).append(match.group(2))
+    return removed, added
+
+
+def _hunks(diff: str) -> Iterator[tuple[list[str], list[str]]]:
+    """Yield the (before, after) lines of every hunk of a tracked-file diff, in order.
+
+    Context lines appear on both sides, so moving or reordering lines changes
+    the hunk. Hunks end where their header's line counts say, so changed lines
+    that look like diff headers are read correctly.
+    """
+    lines = iter(diff.split("\n"))
+    for line in lines:
+        header = _HUNK_HEADER_RE.match(line)
+        if header is None:
+            continue
+        old_count, new_count = (int(count) if count is not None else 1 for count in header.groups())
+        before: list[str] = []
+        after: list[str] = []
+        while old_count > 0 or new_count > 0:
+            hunk_line = next(lines, None)
+            if hunk_line is None:
+                break
+            tag, text = hunk_line[:1], hunk_line[1:]
+            if tag == "-":
+                before.append(text)
+                old_count -= 1
+            elif tag == "+":
+                after.append(text)
+                new_count -= 1
+            elif tag in (" ", ""):
+                before.append(text)
+                after.append(text)
+                old_count -= 1
+                new_count -= 1
+        yield before, after
+
+
+def _is_whitespace_only(diff: str) -> bool:
+    """Return True when every hunk differs only in trailing whitespace and blank lines.
+
+    Whitespace inside or at the start of a line can be significant (token
+    boundaries, string literals, Python indentation), so it is never ignored.
+    """
+    def normalize(lines: list[str]) -> list[str]:
+        return [line.rstrip() for line in lines if line.strip()]
+
+    return all(normalize(before) == normalize(after) for before, after in _hunks(diff))
+
+
+def classify_diff(diff: str) -> DiffSize:
+    """Classify a diff by how much LLM effort it deserves.
+
+    Returns:
+        "trivial" for pure renames and trailing-whitespace or blank-line
+        changes, which can be described without an LLM; "small" when the
+        changed lines total fewer than SMALL_DIFF_BYTES; "large" otherwise.
+    """
+    removed, added = _changed_lines(diff)
+    has_changes = bool(removed or added or _RENAME_FROM_RE.search(diff))
+    # Untracked, binary, added, deleted or chmod-ed files are never mere whitespace
+    has_new_content = (
+        UNTRACKED_FILES_HEADER in diff or _BINARY_FILE_RE.search(diff) or _FILE_MODE_RE.search(diff)
+    )
+    if has_changes and not has_new_content and _is_whitespace_only(diff):
+        return "trivial"
+
+    changed_bytes = sum(len(line.encode("utf-8")) + 1 for line in removed + added)
+    return "small" if changed_bytes < SMALL_DIFF_BYTES else "large"
+
+
+def trivial_commit_message(diff: str) -> str:
+    """Return a Conventional Commits message for a diff classified as "trivial"."""
+    renames = list(zip(_RENAME_FROM_RE.findall(diff), _RENAME_TO_RE.findall(diff)))
+    removed, added = _changed_lines(diff)
+    has_whitespace_changes = bool(removed or added)
+
+    if len(renames) == 1:
+        old_path, new_path = renames[0]
+        description = f"rename {old_path} to {new_path}"
+    elif renames:
+        description = f"rename {len(renames)} files"
+    else:
+        return "style: normalize whitespace"
+
+    if has_whitespace_changes:
+        description += " and normalize whitespace"
+    return f"chore: {description}"
+
+
+def needs_security_review(diff: str) -> bool:
+    """Return True if the diff mentions anything security-relevant (auth, crypto, SQL, I/O, ...)."""
+    return _SECURITY_SENSITIVE_RE.search(diff) is not None
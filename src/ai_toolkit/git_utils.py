@@ -1,14 +1,101 @@
-import warnings
-# Suppress the specific ResourceWarning for subprocess on Windows
-warnings.filterwarnings("ignore", category=ResourceWarning, module="subprocess")
-
-from typing import Optional, Literal
+import atexit
+import functools
+import os
+import re
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Literal
 from git import Repo, GitCommandError
 from pathlib import Path
 
+try:
+    import pygit2
+except ImportError:  # optional: install the `fast-git` extra for in-process diffs
+    pygit2 = None  # type: ignore[assignment]
+
 
 DiffMode = Literal["staged", "uncommitted"]
 
+# Unchanged lines of context around each hunk; every context line is billed as LLM input
+DIFF_CONTEXT_LINES = 1
+
+# Output options shared by every diff sent to the LLM: plain text, no user diff drivers
+DIFF_OUTPUT_ARGS = (f"-U{DIFF_CONTEXT_LINES}", "--no-color", "--no-ext-diff")
+
+# git diff arguments for each mode (before any pathspec)
+DIFF_ARGS: dict[str, tuple[str, ...]] = {
+    "staged": ("diff", "--cached", *DIFF_OUTPUT_ARGS),
+    "uncommitted": ("diff", *DIFF_OUTPUT_ARGS),
+}
+
+# Read buffer for streamed git output; large enough to drain multi-MB diffs in few reads
+STREAM_BUFFER_SIZE = 1024 * 1024
+
+# Separates the tracked-file diff from the untracked files appended after it
+UNTRACKED_FILES_HEADER = "\n\n# Untracked files:\n"
+
+# Untracked files larger than this are listed but not inlined into the diff
+MAX_UNTRACKED_FILE_BYTES = 256 * 1024
+
+# Read buffer for untracked files; larger than the 8 KB default so most files take one read
+UNTRACKED_READ_BUFFER_SIZE = 64 * 1024
+
+# Leading bytes of an untracked file checked for NUL bytes to detect binaries
+BINARY_SNIFF_BYTES = 4096
+
+# Shared pool for reading untracked files; the reads are I/O-bound and independent
+_IO_POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4), thread_name_prefix="ai_toolkit-io")
+
+# Repository handles shared by every GitHelper call, keyed by the directory they were opened from
+_REPO_CACHE: dict[str, Repo] = {}
+# libgit2 handles used for in-process diffs when pygit2 is installed, keyed by repository root
+_LIBGIT2_REPO_CACHE: dict[str, "pygit2.Repository"] = {}
+_REPO_CACHE_LOCK = threading.Lock()
+
+
+def _as_added_lines(content: str) -> str:
+    """Prefix every line of `content` with "+", as git shows the lines of a new file."""
+    content = content.replace("\r\n", "\n")
+    if content.endswith("\n"):
+        content = content[:-1]
+    return "+" + content.replace("\n", "\n+") + "\n"
+
+
+@functools.lru_cache(maxsize=8)
+def _exclude_regex(exclude: tuple[str, ...]) -> re.Pattern:
+    """Compile git glob pathspec patterns (`*`, `?`, `**/`, `/**`) into one regex over repo paths."""
+    def to_regex(pattern: str) -> str:
+        regex = re.escape(pattern)
+        regex = regex.replace(r"\*\*/", "(?:.*/)?").replace(r"/\*\*", "/.*")
+        return regex.replace(r"\*", "[^/]*").replace(r"\?", "[^/]")
+
+    return re.compile("|".join(f"(?:{to_regex(pattern)})" for pattern in exclude) + r"\Z")
+
+
+def _untracked_file_body(file_full_path: Path) -> str:
+    """Return the diff body of an untracked file: its lines as additions, or a short note.
+
+    Files that are too large or binary are never read in full.
+    """
+    try:
+        if not file_full_path.is_file():
+            return "(file not found or not accessible)\n"
+        size = file_full_path.stat().st_size
+        if size > MAX_UNTRACKED_FILE_BYTES:
+            return f"(skipped: {size} bytes)\n"
+        with open(file_full_path, "rb", buffering=UNTRACKED_READ_BUFFER_SIZE) as f:
+            head = f.read(BINARY_SNIFF_BYTES)
+            if b"\0" in head:
+                return "(binary file)\n"
+            data = head + f.read()
+    except OSError:
+        return "(binary or unreadable file)\n"
+
+    content = data.decode("utf-8", errors="ignore")
+    return _as_added_lines(content) if content else ""
+
 
 class GitHelper:
     """Utility wrapper around GitPython for common git operations.
@@ -19,15 +106,65 @@ class GitHelper:
 
     @staticmethod
     def get_repo() -> Repo:
-        repo = Repo(search_parent_directories=True)
-        return repo
+        """Return the repository containing the current directory.
+
+        The repository is discovered and opened once per working directory and
+        closed at exit, so repeated calls skip the parent-directory walk and
+        config parsing. Safe to call from several threads.
+        """
+        cwd = os.getcwd()
+        with _REPO_CACHE_LOCK:
+            repo = _REPO_CACHE.get(cwd)
+            if repo is None:
+                repo = _REPO_CACHE[cwd] = Repo(search_parent_directories=True)
+            return repo
 
     @staticmethod
-    def get_diff(mode: DiffMode = "staged") -> Optional[str]:
+    def _libgit2_repo() -> Optional["pygit2.Repository"]:
+        """Return the pygit2 handle of the current repository, or None if pygit2 is not installed."""
+        if pygit2 is None:
+            return None
+
+        working_dir = str(GitHelper.get_repo().working_dir)
+        with _REPO_CACHE_LOCK:
+            libgit2_repo = _LIBGIT2_REPO_CACHE.get(working_dir)
+            if libgit2_repo is None:
+                libgit2_repo = _LIBGIT2_REPO_CACHE[working_dir] = pygit2.Repository(working_dir)
+            return libgit2_repo
+
+    @staticmethod
+    def shutdown() -> None:
+        """Close every cached repository handle.
+
+        Called when the CLI exits and registered with atexit; safe to call more
+        than once, later calls simply reopen the repository.
+        """
+        with _REPO_CACHE_LOCK:
+            for repo in _REPO_CACHE.values():
+                repo.close()
+            for libgit2_repo in _LIBGIT2_REPO_CACHE.values():
+                libgit2_repo.free()
+            _REPO_CACHE.clear()
+            _LIBGIT2_REPO_CACHE.clear()
+
+    @staticmethod
+    def invalidate() -> None:
+        """Close and forget every cached repository handle and diff, e.g. between tests."""
+        GitHelper.shutdown()
+        GitHelper._memoized_staged_diff.cache_clear()
+
+    @staticmethod
+    def get_diff(mode: DiffMode = "staged", exclude: tuple[str, ...] = ()) -> Optional[str]:
         """Return the git diff based on the specified mode.
 
         Args:
             mode: Either "staged" for staged changes or "uncommitted" for unstaged changes.
+            exclude: git glob patterns (e.g. "**/*.lock") of files to leave out of the diff.
+                They are passed to git as `:(exclude,glob)` pathspecs, so renames stay
+                visible and the command line does not grow with the number of files.
+
+        Staged diffs are memoized per HEAD commit and index file, so asking for
+        the same staged diff twice in one run does not call git again.
 
         Returns:
             The diff output as a string, or None if there are no changes.
@@ -36,77 +173,263 @@ class GitHelper:
             GitCommandError: If git command fails.
         """
         if mode == "staged":
-            return GitHelper._staged_diff()
+            state = GitHelper._staged_state()
+            if state is not None:
+                return GitHelper._memoized_staged_diff(state, exclude)
+
+        build_diff = GitHelper._DIFF_BUILDERS.get(mode)
+        if build_diff is None:
+            raise ValueError(f"Invalid mode: {mode}. Must be 'staged' or 'uncommitted'.")
+        return build_diff(exclude)
+
+    @staticmethod
+    def _staged_state() -> Optional[tuple]:
+        """Return a key that changes whenever the staged diff can change, or None if unknown.
+
+        The key combines the HEAD commit with the identity and timestamp of the
+        index file, which git rewrites on every `add`, `reset` or `commit`.
+        """
+        repo = GitHelper.get_repo()
+        try:
+            head_sha = repo.head.commit.hexsha
+            index_stat = os.stat(Path(repo.git_dir) / "index")
+        except (ValueError, OSError):  # no commit yet, or no index
+            return None
+        return (repo.git_dir, head_sha, index_stat.st_ino, index_stat.st_mtime_ns, index_stat.st_size)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _memoized_staged_diff(state: tuple, exclude: tuple[str, ...]) -> Optional[str]:
+        return GitHelper._staged_diff(exclude)
+
+    @staticmethod
+    def get_changed_files(mode: DiffMode = "staged") -> list[str]:
+        """Return the paths of the files changed in the specified mode.
+
+        For "uncommitted" mode, untracked files are included.
+
+        Raises:
+            GitCommandError: If git command fails.
+        """
+        repo = GitHelper.get_repo()
+        if mode == "staged":
+            # -z keeps non-ASCII and special paths unquoted
+            names = repo.git.diff("--staged", "--name-only", "-z")
+            return [name for name in names.split("\0") if name]
         elif mode == "uncommitted":
-            return GitHelper._uncommitted_diff()
+            modified_files, untracked_files = GitHelper._worktree_status()
+            return modified_files + untracked_files
         else:
             raise ValueError(f"Invalid mode: {mode}. Must be 'staged' or 'uncommitted'.")
 
     @staticmethod
-    def _staged_diff() -> Optional[str]:
-        """Return the staged diff (equivalent to `git diff --staged`).
+    def get_diff_stat(mode: DiffMode = "staged") -> str:
+        """Return the `git diff --stat` summary for the specified mode.
 
-        Returns None when there are no staged changes.
+        For "uncommitted" mode, untracked files are listed after it.
+
+        Raises:
+            GitCommandError: If git command fails.
         """
+        if mode not in DIFF_ARGS:
+            raise ValueError(f"Invalid mode: {mode}. Must be 'staged' or 'uncommitted'.")
+
         repo = GitHelper.get_repo()
+        lines = [repo.git.diff(*DIFF_ARGS[mode][1:], "--stat")]
+        if mode == "uncommitted":
+            _, untracked_files = GitHelper._worktree_status()
+            lines += [f" {file_path} (untracked)" for file_path in untracked_files]
+        return "\n".join(line for line in lines if line)
+
+    @staticmethod
+    def _worktree_status() -> tuple[list[str], list[str]]:
+        """Return the (modified tracked, untracked) files of the working tree from one `git status`.
+
+        Modified files are those whose working tree differs from the index,
+        i.e. the files `git diff` reports.
+        """
+        output = GitHelper.get_repo().git.status("--porcelain=v2", "-z", "--untracked-files=all")
+        modified_files: list[str] = []
+        untracked_files: list[str] = []
+        records = iter(output.split("\0"))
+        for record in records:
+            kind = record[:1]
+            if kind == "?":
+                untracked_files.append(record[2:])
+            elif kind in ("1", "u"):
+                fields = record.split(" ", 10 if kind == "u" else 8)
+                if kind == "u" or fields[1][1] != ".":
+                    modified_files.append(fields[-1])
+            elif kind == "2":
+                fields = record.split(" ", 9)
+                next(records)  # the original path of the rename or copy
+                if fields[1][1] != ".":
+                    modified_files.append(fields[-1])
+        return modified_files, untracked_files
+
+    @staticmethod
+    def _pathspec(exclude: tuple[str, ...]) -> list[str]:
+        """Return the trailing `-- <pathspec>` arguments that leave `exclude` out of a git command."""
+        if not exclude:
+            return []
+        return ["--", ":(top)", *(f":(exclude,glob){pattern}" for pattern in exclude)]
+
+    @staticmethod
+    def _grow_pipe(fd: int) -> None:
+        """Enlarge the kernel buffer of a pipe to STREAM_BUFFER_SIZE where supported (Linux).
+
+        git then blocks less often on a full pipe while a large diff is read.
+        Best effort: the size may exceed the system limit for unprivileged users.
+        """
+        if sys.platform != "linux":
+            return
+        import fcntl
+        try:
+            fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, STREAM_BUFFER_SIZE)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _stream_git(working_dir: str, *args: str) -> Iterator[str]:
+        """Yield the stdout of a git command line by line as git produces it.
+
+        stderr is drained on a background thread so git can never block on a
+        full stderr pipe while stdout is being consumed (the cause of GitPython
+        freezes on Windows).
+
+        Raises:
+            GitCommandError: If the git command exits with a non-zero status.
+        """
+        command = ["git", "--no-pager", *args]
+        process = subprocess.Popen(
+            command,
+            cwd=working_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=STREAM_BUFFER_SIZE,
+        )
+        GitHelper._grow_pipe(process.stdout.fileno())  # type: ignore[union-attr]
+        stderr_chunks: list[bytes] = []
+        stderr_reader = threading.Thread(
+            target=lambda: stderr_chunks.append(process.stderr.read()),  # type: ignore[union-attr]
+            daemon=True,
+        )
+        stderr_reader.start()
         try:
-            diff_output = repo.git.diff("--staged")
-            return diff_output if diff_output else None
-        except GitCommandError as e:
-            # Optionally log or handle the error here
-            raise
+            for line in process.stdout:  # type: ignore[union-attr]
+                yield line.decode("utf-8", errors="replace")
         finally:
-            repo.close()
+            process.stdout.close()  # type: ignore[union-attr]
+            status = process.wait()
+            stderr_reader.join()
+            process.stderr.close()  # type: ignore[union-attr]
+
+        if status != 0:
+            raise GitCommandError(command, status, b"".join(stderr_chunks))
 
     @staticmethod
-    def _uncommitted_diff() -> Optional[str]:
+    def iter_diff(mode: DiffMode = "staged", exclude: tuple[str, ...] = ()) -> Iterator[str]:
+        """Yield the tracked-file diff for the specified mode line by line.
+
+        The output is streamed from git, so callers that only need to hash or
+        size the diff can stop early without materializing all of it.
+        Untracked files are not included.
+
+        Raises:
+            GitCommandError: If git command fails.
+        """
+        if mode not in DIFF_ARGS:
+            raise ValueError(f"Invalid mode: {mode}. Must be 'staged' or 'uncommitted'.")
+
+        working_dir = str(GitHelper.get_repo().working_dir)
+        yield from GitHelper._stream_git(working_dir, *DIFF_ARGS[mode], *GitHelper._pathspec(exclude))
+
+    @staticmethod
+    def _tracked_diff(mode: DiffMode, exclude: tuple[str, ...] = ()) -> str:
+        """Return the tracked-file diff for the specified mode.
+
+        With pygit2 installed the diff is computed in-process by libgit2, which
+        saves spawning a git process. Otherwise, or if libgit2 cannot produce
+        the same diff as git (e.g. before the first commit, or during a merge
+        conflict, where git shows a combined diff with the conflict markers),
+        the git binary is used.
+        """
+        libgit2_repo = GitHelper._libgit2_repo()
+        if libgit2_repo is not None:
+            try:
+                index = libgit2_repo.index
+                index.read()  # pick up changes staged since the handle was opened
+                if index.conflicts is None:
+                    if mode == "staged":
+                        head_tree = libgit2_repo.revparse_single("HEAD").peel(pygit2.Tree)
+                        diff = index.diff_to_tree(head_tree, context_lines=DIFF_CONTEXT_LINES)
+                    else:
+                        diff = index.diff_to_workdir(context_lines=DIFF_CONTEXT_LINES)
+                    diff.find_similar()
+                    patches = [patch for patch in diff if patch is not None]
+                    if exclude:
+                        excluded = _exclude_regex(exclude)
+                        patches = [patch for patch in patches if not excluded.match(patch.delta.new_file.path)]
+                    return "".join(patch.text for patch in patches)
+            except (pygit2.GitError, KeyError):
+                pass
+
+        return "".join(GitHelper.iter_diff(mode, exclude))
+
+    @staticmethod
+    def _staged_diff(exclude: tuple[str, ...] = ()) -> Optional[str]:
+        """Return the staged diff (equivalent to `git diff --staged`).
+
+        Returns None when there are no staged changes.
+        """
+        diff_output = GitHelper._tracked_diff("staged", exclude)
+        return diff_output if diff_output else None
+
+    @staticmethod
+    def _uncommitted_diff(exclude: tuple[str, ...] = ()) -> Optional[str]:
         """Return the uncommitted diff (equivalent to `git diff`).
 
         Returns None when there are no uncommitted changes.
         Includes untracked files in the diff output.
         """
         repo = GitHelper.get_repo()
-        try:
-            # Get diff of tracked files
-            diff_output = repo.git.diff()
-            
-            # Get untracked files
-            untracked_files = repo.untracked_files
-            
-            # If there are untracked files, append their content to diff
-            if untracked_files:
-                untracked_diff = "\n\n# Untracked files:\n"
-                for file_path in untracked_files:
-                    untracked_diff += f"\n+++ b/{file_path}\n"
-                    try:
-                        file_full_path = Path(repo.working_dir) / file_path
-                        if file_full_path.exists() and file_full_path.is_file():
-                            with open(file_full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read()
-                                for line in content.splitlines():
-                                    untracked_diff += f"+{line}\n"
-                        else:
-                            untracked_diff += f"(file not found or not accessible)\n"
-                    except Exception:
-                        untracked_diff += f"(binary or unreadable file)\n"
-                
-                diff_output = (diff_output + untracked_diff) if diff_output else untracked_diff
-            
-            return diff_output if diff_output else None
-        except GitCommandError as e:
-            # Optionally log or handle the error here
-            raise
-        finally:
-            repo.close()
+        modified_files, untracked_files = GitHelper._worktree_status()
+        if exclude:
+            excluded = _exclude_regex(exclude)
+            modified_files = [file_path for file_path in modified_files if not excluded.match(file_path)]
+            untracked_files = [file_path for file_path in untracked_files if not excluded.match(file_path)]
+
+        # Get diff of tracked files, skipped when git status shows none modified
+        diff_output = GitHelper._tracked_diff("uncommitted", exclude) if modified_files else ""
+        
+        # If there are untracked files, append their content to diff
+        if untracked_files:
+            root = Path(repo.working_dir)
+            bodies = _IO_POOL.map(_untracked_file_body, [root / file_path for file_path in untracked_files])
+            parts = [UNTRACKED_FILES_HEADER]
+            for file_path, body in zip(untracked_files, bodies):
+                parts.append(f"\n+++ b/{file_path}\n")
+                parts.append(body)
+            untracked_diff = "".join(parts)
+
+            diff_output = (diff_output + untracked_diff) if diff_output else untracked_diff
+        
+        return diff_output if diff_output else None
+
+    # Diff builder for each mode, used by get_diff
+    _DIFF_BUILDERS = {
+        "staged": _staged_diff,
+        "uncommitted": _uncommitted_diff,
+    }
 
     @staticmethod
-    def commit(message: str) -> None:
-        """Create a commit with the provided message using the repo index."""
-        repo = GitHelper.get_repo()
-        try:
-            repo.index.commit(message)
-        except GitCommandError as e:
-            # Optionally log or handle the error here
-            raise
-        finally:
-            repo.close()
+    def commit(message: str, skip_hooks: bool = False) -> None:
+        """Create a commit with the provided message using the repo index.
+
+        With `skip_hooks`, the pre-commit and commit-msg hooks are not run (like
+        `git commit --no-verify`), so no hook processes are spawned.
+        """
+        GitHelper.get_repo().index.commit(message, skip_hooks=skip_hooks)
+
+
+atexit.register(GitHelper.shutdown)
@@ -1,9 +1,13 @@
 import click
 from dotenv import load_dotenv
-from ai_toolkit.model_helper import get_model
+from ai_toolkit.git_utils import GitHelper
+from ai_toolkit.model_helper import configure_llm_cache
 
 from .commands import commit, review
 
+# Streamed chunks written to the terminal at once, unless a newline arrives first
+STREAM_FLUSH_CHUNKS = 8
+
 @click.group()
 @click.option(
     "--model",
@@ -19,6 +23,9 @@ def cli(ctx, model: str):
     # Store model in context so subcommands can access it
     ctx.ensure_object(dict)
     ctx.obj["model"] = model
+    configure_llm_cache()
+    # Release the shared git repository handles once the command finishes
+    ctx.call_on_close(GitHelper.shutdown)
 
 
 load_dotenv()  # Load credentials from .env
@@ -27,13 +34,19 @@ load_dotenv()  # Load credentials from .env
 @click.pass_context
 def hello(ctx):
     """Print a hello message from the AI toolbox."""
+    from ai_toolkit.model_helper import get_model
+
     model = ctx.obj["model"]
 
     llm = get_model(model, temperature=0.5)
     response = llm.stream("Generate a friendly hello message from the AI toolbox.")
+    buffer: list[str] = []
     for chunk in response:
-        click.echo(chunk.content, nl=False)
-    click.echo()  # Print newline at the end
+        buffer.append(chunk.text)
+        if len(buffer) >= STREAM_FLUSH_CHUNKS or "\n" in chunk.text:
+            click.echo("".join(buffer), nl=False)
+            buffer.clear()
+    click.echo("".join(buffer))  # Print the rest and a newline at the end
 
 
 # Register the commit command
@@ -1,11 +1,114 @@
-from langchain.chat_models import init_chat_model
-from langchain_core.language_models import BaseChatModel
+import functools
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
+if TYPE_CHECKING:
+    # langchain is imported on first use so CLI startup (e.g. `--help`) does not pay for it
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.runnables import Runnable
+    from pydantic import BaseModel
 
+# Local LLM response cache shared by all commands
+LLM_CACHE_PATH = Path("~/.cache/ai_toolkit/llm.db").expanduser()
+
+# Set this environment variable (e.g. in CI) to always hit the provider
+DISABLE_CACHE_ENV_VAR = "AI_TOOLKIT_DISABLE_CACHE"
+
+# Cheaper, faster sibling of each model for small diffs
+SMALLER_MODELS = {
+    "gpt-4o": "gpt-4o-mini",
+    "gpt-4.1": "gpt-4.1-mini",
+    "gpt-5": "gpt-5-mini",
+}
+
+
+# Bare model-name prefixes of each provider, shared by model construction,
+# structured output and prompt caching so they always agree on the provider
+OPENAI_MODEL_PREFIXES = ("gpt-", "o1", "o3", "o4", "chatgpt")
+ANTHROPIC_MODEL_PREFIXES = ("claude",)
+
+
+def is_openai_model(model_name: str) -> bool:
+    """Return True when the model name resolves to the OpenAI provider."""
+    return model_name.startswith((*OPENAI_MODEL_PREFIXES, "openai:"))
+
+
+def is_anthropic_model(model_name: str) -> bool:
+    """Return True when the model name resolves to the Anthropic provider."""
+    return model_name.startswith((*ANTHROPIC_MODEL_PREFIXES, "anthropic:"))
+
+
+def structured_output_options(model_name: str) -> dict:
+    """Return the `with_structured_output` keyword arguments best suited to the model.
+
+    OpenAI models use native JSON-schema structured outputs in strict mode, so
+    the server constrains decoding to the schema instead of relying on a tool
+    call. Other providers keep LangChain's default method.
+    """
+    if is_openai_model(model_name):
+        return {"method": "json_schema", "strict": True}
+    return {}
+
+
+def configure_llm_cache() -> None:
+    """Enable LangChain's global SQLite cache for LLM responses.
+
+    Identical (model, messages) requests - e.g. re-running a review on the same
+    staged diff - are then answered from local storage instead of the provider.
+    Does nothing when the `AI_TOOLKIT_DISABLE_CACHE` environment variable is set,
+    or when the cache database cannot be created (e.g. a read-only home).
+    """
+    if os.environ.get(DISABLE_CACHE_ENV_VAR):
+        return
+
+    from langchain_community.cache import SQLiteCache
+    from langchain_core.globals import set_llm_cache
+    from sqlalchemy.exc import SQLAlchemyError
+
+    try:
+        LLM_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        set_llm_cache(SQLiteCache(database_path=str(LLM_CACHE_PATH)))
+    except (OSError, SQLAlchemyError):
+        pass  # the cache is an optimization: run without it
+
+
+def _openai_chat_model(model_name: str, temperature: float, timeout: int) -> "BaseChatModel":
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(model=model_name, temperature=temperature, timeout=timeout)
+
+
+def _anthropic_chat_model(model_name: str, temperature: float, timeout: int) -> "BaseChatModel":
+    from langchain_anthropic import ChatAnthropic
+
+    return ChatAnthropic(model=model_name, temperature=temperature, timeout=timeout)  # type: ignore[call-arg]
+
+
+# Chat model factory for each bare model-name prefix; anything else goes through init_chat_model
+CHAT_MODEL_FACTORIES: dict[tuple[str, ...], Callable[[str, float, int], "BaseChatModel"]] = {
+    OPENAI_MODEL_PREFIXES: _openai_chat_model,
+    ANTHROPIC_MODEL_PREFIXES: _anthropic_chat_model,
+}
+
+
+@functools.lru_cache(maxsize=8)
 def get_model(model_name: str,
               temperature: float = 0.5,
-              timeout: int = 600) -> BaseChatModel:
-    """Utility to get the LLM model instance based on the model name."""
+              timeout: int = 600) -> "BaseChatModel":
+    """Utility to get the LLM model instance based on the model name.
+
+    Instances are memoized per (model_name, temperature, timeout) so repeated
+    calls - e.g. every commit adjustment turn - reuse the same client and its
+    HTTP connection pool instead of paying setup and TLS handshakes again.
+    Known OpenAI and Anthropic model names are built directly by their
+    provider class; other names (e.g. "provider:model") use `init_chat_model`.
+    """
+    for prefixes, factory in CHAT_MODEL_FACTORIES.items():
+        if model_name.startswith(prefixes):
+            return factory(model_name, temperature, timeout)
+
+    from langchain.chat_models import init_chat_model
 
     llm: BaseChatModel = init_chat_model(
         model_name,
@@ -13,4 +116,19 @@ def get_model(model_name: str,
         timeout=timeout
     )  # type: ignore
 
-    return llm
\ No newline at end of file
+    return llm
+
+
+@functools.lru_cache(maxsize=8)
+def get_structured_model(model_name: str, schema: "type[BaseModel]") -> "Runnable":
+    """Return the model bound to structured output for `schema`.
+
+    The binding converts the schema to JSON schema once per (model_name, schema),
+    so every persona and the synthesis step share the same runnable.
+    """
+    return get_model(model_name).with_structured_output(schema, **structured_output_options(model_name))
+
+
+def get_smaller_model(model_name: str) -> str:
+    """Return the smaller sibling of the model, or the model itself if none is known."""
+    return SMALLER_MODELS.get(model_name, model_name)
@@ -0,0 +1,19 @@
+import importlib
+
+commit = importlib.import_module("ai_toolkit.commands.commit")
+
+
+def test_split_candidates():
+    response = "feat: add a\n\nbody line\n---\n  ---  \n\nfix: b\n---\n"
+    assert commit.split_candidates(response) == ["feat: add a\n\nbody line", "fix: b"]
+    assert commit.split_candidates("chore: only one\n") == ["chore: only one"]
+    assert commit.split_candidates("---\n\n---") == []
+
+
+def test_choose_candidate_prompts_for_a_pick(monkeypatch):
+    monkeypatch.setattr(commit, "generate_commit_message", lambda diff, messages, model: "feat: a\n---\nfix: b\n")
+    monkeypatch.setattr(commit.click, "prompt", lambda *args, **kwargs: 2)
+    assert commit.choose_candidate("diff", count=2, model="gpt-4o-mini") == "fix: b"
+
+    monkeypatch.setattr(commit, "generate_commit_message", lambda diff, messages, model: "feat: only\n")
+    assert commit.choose_candidate("diff", count=2, model="gpt-4o-mini") == "feat: only"
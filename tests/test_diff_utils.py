@@ -0,0 +1,104 @@
+from ai_toolkit.diff_utils import (
+    LOW_SIGNAL_PATHSPECS,
+    chunk_diff_by_file,
+    classify_diff,
+    is_low_signal_path,
+    split_diff_by_file,
+    trivial_commit_message,
+    truncate_diff,
+)
+from ai_toolkit.git_utils import UNTRACKED_FILES_HEADER, _exclude_regex
+
+
+def _file_diff(path: str, lines: int) -> str:
+    body = "".join(f"+line {i}\n" for i in range(lines))
+    return f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n@@ -0,0 +1,{lines} @@\n{body}"
+
+
+def test_is_low_signal_path():
+    assert is_low_signal_path("package-lock.json")
+    assert is_low_signal_path("web/static/app.min.js")
+    assert is_low_signal_path("vendor/lib/module.py")
+    assert not is_low_signal_path("src/ai_toolkit/main.py")
+
+
+def test_low_signal_pathspecs_match_is_low_signal_path():
+    excluded = _exclude_regex(LOW_SIGNAL_PATHSPECS)
+    for path in ("poetry.lock", "web/package-lock.json", "a/b/app.min.js", "vendor/x.py",
+                 "src/node_modules/m/index.js", "src/main.py", "vendored.py", "my-package-lock.json"):
+        assert bool(excluded.match(path)) == is_low_signal_path(path), path
+
+
+def test_split_diff_by_file_includes_untracked_files():
+    diff = _file_diff("a.py", 2) + _file_diff("b.py", 1) + UNTRACKED_FILES_HEADER + "\n+++ b/c.py\n+new\n"
+    sections = split_diff_by_file(diff)
+    assert len(sections) == 3
+    assert sections[0].startswith("diff --git a/a.py")
+    assert sections[2] == "\n+++ b/c.py\n+new\n"
+
+
+def test_chunk_diff_by_file_keeps_files_whole():
+    a, b, c = _file_diff("a.py", 2), _file_diff("b.py", 2), _file_diff("c.py", 50)
+    assert chunk_diff_by_file(a + b + c, max_bytes=len(a + b)) == [a + b, c]
+    assert chunk_diff_by_file(a + b, max_bytes=1) == [a, b]
+
+
+def test_truncate_diff_drops_largest_files_first():
+    small, large = _file_diff("small.py", 2), _file_diff("large.py", 200)
+    diff = small + large
+    assert truncate_diff(diff, max_bytes=len(diff)) == diff
+
+    truncated = truncate_diff(diff, max_bytes=len(small) + 10)
+    assert truncated.startswith(small)
+    assert "large.py" not in truncated
+    assert f"# omitted 1 files totaling {len(large)} bytes" in truncated
+
+
+def test_classify_diff():
+    rename = "diff --git a/old.py b/new.py\nsimilarity index 100%\nrename from old.py\nrename to new.py\n"
+    assert classify_diff(rename) == "trivial"
+    assert trivial_commit_message(rename) == "chore: rename old.py to new.py"
+
+    whitespace = "diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -1 +1,2 @@\n-x = 1  \n+x = 1\n+\n"
+    assert classify_diff(whitespace) == "trivial"
+    assert trivial_commit_message(whitespace) == "style: normalize whitespace"
+
+    assert classify_diff(_file_diff("a.py", 3)) == "small"
+    assert classify_diff(_file_diff("a.py", 1000)) == "large"
+
+
+def _one_line_change(old: str, new: str) -> str:
+    return f"diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -1 +1 @@\n-{old}\n+{new}\n"
+
+
+def test_classify_diff_keeps_significant_whitespace():
+    assert classify_diff(_one_line_change("return a", "returna")) == "small"
+    assert classify_diff(_one_line_change("import os", "importos")) == "small"
+    assert classify_diff(_one_line_change('s = "a b"', 's = "ab"')) == "small"
+    assert classify_diff(_one_line_change('s = "a b"', 's = "a  b"')) == "small"
+    assert classify_diff(_one_line_change("x = 1", "x  =  1")) == "small"
+    # Dedenting a line out of an if block changes control flow
+    assert classify_diff(_one_line_change("    cleanup()", "cleanup()")) == "small"
+
+
+def test_classify_diff_keeps_moved_lines():
+    reordered = (
+        "diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -1,2 +1,2 @@\n"
+        "-check_auth(user)\n delete_account(user)\n+check_auth(user)\n"
+    )
+    assert classify_diff(reordered) == "small"
+
+    moved_between_files = (
+        "diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -1 +0,0 @@\n-check_auth(user)\n"
+        "diff --git a/b.py b/b.py\n--- a/b.py\n+++ b/b.py\n@@ -0,0 +1 @@\n+check_auth(user)\n"
+    )
+    assert classify_diff(moved_between_files) == "small"
+
+
+def test_classify_diff_ignores_quoted_file_headers():
+    quoted = (
+        'diff --git "a/caf\\303\\251.py" "b/caf\\303\\251.py"\n'
+        '--- "a/caf\\303\\251.py"\n+++ "b/caf\\303\\251.py"\n@@ -1,2 +1,2 @@\n-x = 1 \n+x = 1\n y = 2\n'
+    )
+    assert classify_diff(quoted) == "trivial"
+    assert trivial_commit_message(quoted) == "style: normalize whitespace"
@@ -0,0 +1,153 @@
+import subprocess
+
+import pytest
+
+from ai_toolkit.diff_utils import LOW_SIGNAL_ONLY_HEADER, get_trimmed_diff
+from ai_toolkit.git_utils import GitHelper
+
+
+def _git(*args: str) -> None:
+    subprocess.run(["git", *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def git_repo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _git("init", "-q")
+    _git("config", "user.name", "Test")
+    _git("config", "user.email", "test@example.com")
+    (tmp_path / "README.md").write_text("hello\n")
+    _git("add", "README.md")
+    _git("commit", "-q", "-m", "init")
+    GitHelper.invalidate()
+    yield tmp_path
+    GitHelper.invalidate()
+
+
+def test_staged_non_ascii_path_survives_low_signal_filter(git_repo):
+    (git_repo / "café.py").write_text("x = 1\n")
+    (git_repo / "package-lock.json").write_text("{}\n")
+    _git("add", ".")
+
+    assert sorted(GitHelper.get_changed_files("staged")) == ["café.py", "package-lock.json"]
+    diff = get_trimmed_diff("staged")
+    assert diff is not None
+    assert "+x = 1" in diff
+    assert "package-lock.json" not in diff
+
+
+def _start_conflicted_merge(repo_path) -> None:
+    _git("checkout", "-q", "-b", "other")
+    (repo_path / "README.md").write_text("theirs\n")
+    _git("commit", "-q", "-am", "theirs")
+    _git("checkout", "-q", "-")
+    (repo_path / "README.md").write_text("ours\n")
+    _git("commit", "-q", "-am", "ours")
+    subprocess.run(["git", "merge", "-q", "other"], capture_output=True)
+
+
+def test_uncommitted_diff_shows_conflict_markers(git_repo):
+    _start_conflicted_merge(git_repo)
+
+    diff = GitHelper.get_diff("uncommitted")
+    assert diff is not None
+    assert "diff --cc README.md" in diff
+    assert "<<<<<<<" in diff
+
+
+def test_worktree_status(git_repo):
+    (git_repo / "dir with space").mkdir()
+    (git_repo / "dir with space" / "café.txt").write_text("one\n")
+    (git_repo / "old.txt").write_text("renamed content\n" * 5)
+    (git_repo / "staged only.txt").write_text("one\n")
+    _git("add", ".")
+    _git("commit", "-q", "-m", "files")
+
+    _git("mv", "old.txt", "new.txt")
+    (git_repo / "new.txt").write_text("renamed content\n" * 5 + "edit\n")
+    (git_repo / "dir with space" / "café.txt").write_text("two\n")
+    (git_repo / "staged only.txt").write_text("two\n")
+    _git("add", "staged only.txt")
+    (git_repo / "untracked ü.txt").write_text("new\n")
+
+    modified, untracked = GitHelper._worktree_status()
+    assert sorted(modified) == ["dir with space/café.txt", "new.txt"]
+    assert untracked == ["untracked ü.txt"]
+
+
+def test_worktree_status_lists_unmerged_files(git_repo):
+    _start_conflicted_merge(git_repo)
+
+    modified, untracked = GitHelper._worktree_status()
+    assert modified == ["README.md"]
+    assert untracked == []
+
+
+def test_staged_diff_memo_follows_the_index(git_repo):
+    (git_repo / "README.md").write_text("first\n")
+    _git("add", "README.md")
+    assert "+first" in GitHelper.get_diff("staged")
+
+    (git_repo / "README.md").write_text("second\n")
+    _git("add", "README.md")
+    diff = GitHelper.get_diff("staged")
+    assert "+second" in diff
+    assert "+first" not in diff
+
+    _git("commit", "-q", "-m", "second")
+    assert GitHelper.get_diff("staged") is None
+
+
+def test_invalidate_clears_memoized_diffs_and_handles(git_repo):
+    (git_repo / "README.md").write_text("first\n")
+    _git("add", "README.md")
+    repo = GitHelper.get_repo()
+    GitHelper.get_diff("staged")
+    assert GitHelper._memoized_staged_diff.cache_info().currsize == 1
+
+    GitHelper.invalidate()
+    assert GitHelper._memoized_staged_diff.cache_info().currsize == 0
+    assert GitHelper.get_repo() is not repo
+    assert "+first" in GitHelper.get_diff("staged")
+
+
+def test_low_signal_files_are_excluded_by_pathspec(git_repo):
+    (git_repo / "vendor").mkdir()
+    (git_repo / "vendor" / "lib.py").write_text("vendored\n")
+    (git_repo / "poetry.lock").write_text("lock\n")
+    (git_repo / "app.py").write_text("x = 1\n")
+    _git("add", ".")
+
+    diff = get_trimmed_diff("staged")
+    assert "+x = 1" in diff
+    assert "poetry.lock" not in diff
+    assert "vendor/lib.py" not in diff
+
+
+def test_staged_rename_survives_low_signal_filter(git_repo):
+    (git_repo / "package-lock.json").write_text("{}\n")
+    _git("add", ".")
+    _git("commit", "-q", "-m", "lock")
+    _git("mv", "README.md", "GUIDE.md")
+    (git_repo / "package-lock.json").write_text('{"a": 1}\n')
+    _git("add", ".")
+
+    diff = get_trimmed_diff("staged")
+    assert "rename from README.md" in diff
+    assert "package-lock.json" not in diff
+
+
+@pytest.mark.parametrize("mode", ["staged", "uncommitted"])
+def test_only_low_signal_changes_get_a_stat_stand_in(git_repo, mode):
+    (git_repo / "package-lock.json").write_text("{}\n")
+    (git_repo / "poetry.lock").write_text("lock\n")
+    _git("add", "package-lock.json")
+    if mode == "staged":
+        _git("add", "poetry.lock")
+
+    diff = get_trimmed_diff(mode)
+    assert diff is not None
+    assert diff.startswith(LOW_SIGNAL_ONLY_HEADER)
+    assert "poetry.lock" in diff
+    if mode == "staged":
+        assert "package-lock.json" in diff
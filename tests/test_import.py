@@ -4,3 +4,8 @@ import importlib
 def test_import():
     pkg = importlib.import_module("ai_toolkit")
     assert hasattr(pkg, "__version__")
+
+
+def test_cli_is_lazily_exported():
+    pkg = importlib.import_module("ai_toolkit")
+    assert callable(pkg.cli)
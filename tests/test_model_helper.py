@@ -0,0 +1,26 @@
+from langchain_core.globals import get_llm_cache, set_llm_cache
+
+from ai_toolkit import model_helper
+
+
+def test_configure_llm_cache_runs_without_cache_when_unwritable(monkeypatch, tmp_path):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    monkeypatch.delenv(model_helper.DISABLE_CACHE_ENV_VAR, raising=False)
+    monkeypatch.setattr(model_helper, "LLM_CACHE_PATH", blocker / "ai_toolkit" / "llm.db")
+
+    set_llm_cache(None)
+    model_helper.configure_llm_cache()
+    assert get_llm_cache() is None
+
+
+def test_provider_checks_match_the_factory_table():
+    assert model_helper.CHAT_MODEL_FACTORIES[model_helper.OPENAI_MODEL_PREFIXES] is model_helper._openai_chat_model
+    for name in ("gpt-4o", "o3-mini", "chatgpt-4o-latest", "openai:gpt-4o"):
+        assert model_helper.is_openai_model(name)
+        assert not model_helper.is_anthropic_model(name)
+    for name in ("claude-sonnet-4-5", "anthropic:claude-sonnet-4-5"):
+        assert model_helper.is_anthropic_model(name)
+        assert not model_helper.is_openai_model(name)
+    assert model_helper.structured_output_options("gpt-4o") == {"method": "json_schema", "strict": True}
+    assert model_helper.structured_output_options("claude-sonnet-4-5") == {}
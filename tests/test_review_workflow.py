@@ -0,0 +1,46 @@
+import importlib
+
+import pytest
+
+from ai_toolkit.commands.review.review_models import ReviewResult
+
+workflow = importlib.import_module("ai_toolkit.commands.review.workflow")
+
+
+def _one_line_change(old: str, new: str) -> str:
+    return f"diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -1 +1 @@\n-{old}\n+{new}\n"
+
+
+@pytest.mark.parametrize(
+    "diff",
+    [
+        _one_line_change("    cleanup()", "cleanup()"),
+        _one_line_change('s = "a b"', 's = "ab"'),
+        "diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -1,2 +1,2 @@\n"
+        "-check_auth(user)\n delete_account(user)\n+check_auth(user)\n",
+    ],
+)
+def test_perform_review_sends_whitespace_sensitive_edits_for_review(monkeypatch, diff):
+    reviewed = []
+
+    async def fake_specialist_reviews(diff, model, diff_hash=None):
+        reviewed.append(diff)
+        return {persona: ReviewResult(issues=[], summary="", aggregated_suggestions=[]) for persona in workflow.PERSONAS}
+
+    monkeypatch.setenv(workflow.DISABLE_CACHE_ENV_VAR, "1")
+    monkeypatch.setattr(workflow, "run_specialist_reviews", fake_specialist_reviews)
+
+    review = workflow.perform_review(diff, model="gpt-4o-mini")
+    assert reviewed == [diff]
+    assert review.summary != workflow.no_semantic_changes_review().summary
+
+
+def test_store_cached_review_ignores_unwritable_cache(monkeypatch, tmp_path):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    monkeypatch.delenv(workflow.DISABLE_CACHE_ENV_VAR, raising=False)
+    monkeypatch.setattr(workflow, "REVIEW_CACHE_DIR", blocker / "reviews")
+
+    review = ReviewResult(issues=[], summary="ok", aggregated_suggestions=[])
+    workflow.store_cached_review("hash", "gpt-4o-mini", False, review)
+    assert workflow.load_cached_review("hash", "gpt-4o-mini", False) is None